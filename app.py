@@ -1,14 +1,41 @@
 import streamlit as st
+import hashlib
 import os
-import plotly.express as px
-import pandas as pd
-from resume_parser import ResumeParser
+from resume_parser import ParseError, ResumeParser
 from job_analyzer import JobAnalyzer
 from gemini_optimizer import GeminiOptimizer
+from resume_optimizer import ResumeOptimizer
+
+
+@st.cache_resource
+def get_job_analyzer() -> JobAnalyzer:
+    """Load the NLP models once per process and share them across sessions"""
+    return JobAnalyzer()
+
+
+@st.cache_resource
+def get_gemini_optimizer(api_key: str) -> GeminiOptimizer:
+    """Create the Gemini client once per API key and share it across sessions"""
+    return GeminiOptimizer(api_key)
+
+
+@st.cache_resource
+def get_resume_optimizer() -> ResumeOptimizer:
+    """Load the offline optimizer used when no Gemini API key is configured"""
+    return ResumeOptimizer()
+
+
+@st.cache_data(show_spinner=False, hash_funcs={bytes: lambda content: hashlib.sha256(content).hexdigest()})
+def _parse_resume_cached(file_content: bytes, file_type: str) -> str:
+    """Parse a resume, reusing the result for identical file contents"""
+    return ResumeParser.parse_resume(file_content, file_type)
+
+
+@st.cache_data
+def calculate_match_score_cached(resume_text: str, job_description: str):
+    """Score a resume against a job description, reusing results for identical inputs"""
+    return get_job_analyzer().calculate_match_score(resume_text, job_description)
 
-# Initialize the analyzers
-job_analyzer = JobAnalyzer()
-gemini_optimizer = GeminiOptimizer(os.getenv('GEMINI_API_KEY'))
 
 # Set page configuration
 st.set_page_config(
@@ -24,6 +51,17 @@ st.markdown("""
     Upload your resume and job description to get started!
 """)
 
+# Get Gemini API key from environment variable or Streamlit secrets
+gemini_api_key = os.getenv('GEMINI_API_KEY')
+if not gemini_api_key:
+    try:
+        gemini_api_key = st.secrets.get('GEMINI_API_KEY')
+    except FileNotFoundError:
+        # No secrets.toml exists; continue without a key
+        gemini_api_key = None
+if not gemini_api_key:
+    st.warning("⚠️ Gemini API key not found. Some advanced AI features may be limited.")
+
 # Create two columns for resume and job description uploads
 col1, col2 = st.columns(2)
 
@@ -49,25 +87,49 @@ if st.button("Analyze Resume", type="primary"):
         st.error("Please provide the job description!")
     else:
         with st.spinner("Analyzing your resume..."):
+            gemini_optimizer = get_gemini_optimizer(gemini_api_key)
+            
             # Get file type and content
             file_type = resume_file.name.split('.')[-1]
             file_content = resume_file.read()
             
             # Parse resume
-            resume_text = ResumeParser.parse_resume(file_content, file_type)
+            try:
+                resume_text = _parse_resume_cached(file_content, file_type)
+            except ParseError:
+                resume_text = None
             
             if resume_text:
                 st.success("Resume parsed successfully!")
                 
-                # Generate professional summary
-                summary = gemini_optimizer.generate_professional_summary(resume_text, job_description)
+                # Reuse the shared Gemini optimizer, falling back to offline suggestions without a key
+                resume_optimizer = gemini_optimizer if gemini_api_key else get_resume_optimizer()
                 
-                # Display professional summary
-                with st.expander("✨ AI-Generated Professional Summary", expanded=True):
-                    st.markdown(summary)
+                # Split resume into sections (simplified for now)
+                resume_sections = {"content": resume_text}
+                
+                # Start the independent Gemini calls in the background
+                optimization_future = gemini_optimizer.submit(
+                    resume_optimizer.optimize_resume, resume_sections, job_description
+                )
+                
+                # Analyze resume and job description match while Gemini works
+                similarity_score, analysis = calculate_match_score_cached(resume_text, job_description)
+                
+                # Create skill visualization
+                matching_skills = analysis.get('matching_skills', [])
+                missing_skills = analysis.get('missing_skills', [])
                 
-                # Analyze resume and job description match
-                similarity_score, analysis = job_analyzer.calculate_match_score(resume_text, job_description)
+                # Fetch suggestions for every missing skill in one request
+                suggestions_future = gemini_optimizer.submit(
+                    gemini_optimizer.generate_skill_suggestions_batch, missing_skills, job_description
+                )
+                
+                # Stream the professional summary as it is generated
+                with st.expander("✨ AI-Generated Professional Summary", expanded=True):
+                    summary = st.write_stream(
+                        gemini_optimizer.stream_professional_summary(resume_text, job_description)
+                    )
                 
                 # Display results
                 st.subheader("Analysis Results")
@@ -85,31 +147,17 @@ if st.button("Analyze Resume", type="primary"):
                     st.metric("ATS Optimization Score", f"{analysis['ats_score']:.1f}%")
                     st.progress(float(analysis['ats_score']) / 100)
                 
-                # Create skill visualization
-                matching_skills = analysis.get('matching_skills', [])
-                missing_skills = analysis.get('missing_skills', [])
-                
-                # Prepare data for visualization
-                skill_data = pd.DataFrame({
-                    'Skill': matching_skills + missing_skills,
-                    'Status': ['Matched'] * len(matching_skills) + ['Missing'] * len(missing_skills),
-                    'Count': [1] * (len(matching_skills) + len(missing_skills))
-                })
-                
-                # Create bar chart
-                fig = px.bar(
-                    skill_data,
-                    x='Status',
-                    y='Count',
-                    color='Status',
-                    title='Skills Analysis',
-                    labels={'Count': 'Number of Skills'},
-                    color_discrete_map={'Matched': 'green', 'Missing': 'red'}
+                # Display skills chart
+                st.markdown("#### Skills Analysis")
+                st.bar_chart(
+                    {
+                        "Status": ["Matched", "Missing"],
+                        "Number of Skills": [len(matching_skills), len(missing_skills)]
+                    },
+                    x="Status",
+                    y="Number of Skills"
                 )
                 
-                # Display chart
-                st.plotly_chart(fig)
-                
                 # Display formatting analysis
                 with st.expander("📋 Formatting Analysis"):
                     if analysis["formatting_analysis"]["formatting_issues"]:
@@ -163,9 +211,10 @@ if st.button("Analyze Resume", type="primary"):
                 with skill_col2:
                     st.markdown('<div class="skills-card missing-skills">', unsafe_allow_html=True)
                     st.markdown("### ❌ Missing Skills")
+                    suggestions = suggestions_future.result()
                     for skill in missing_skills:
                         st.markdown(f"**•** {skill}")
-                        suggestion = gemini_optimizer.generate_skill_suggestions(skill, job_description)
+                        suggestion = suggestions[skill]
                         st.markdown(f'<div class="suggestion-box">💡 {suggestion}</div>', unsafe_allow_html=True)
                     st.markdown('</div>', unsafe_allow_html=True)
                 
@@ -178,25 +227,6 @@ if st.button("Analyze Resume", type="primary"):
                     mime="text/markdown"
                 )
                 
-                # Display skills analysis
-                skill_col1, skill_col2 = st.columns(2)
-                
-                with skill_col1:
-                    st.write("✅ **Matching Skills:**")
-                    if analysis["matching_skills"]:
-                        for skill in analysis["matching_skills"]:
-                            st.success(f"• {skill}")
-                    else:
-                        st.info("No direct skill matches found")
-                
-                with skill_col2:
-                    st.write("❌ **Missing Skills:**")
-                    if analysis["missing_skills"]:
-                        for skill in analysis["missing_skills"]:
-                            st.error(f"• {skill}")
-                    else:
-                        st.success("No missing skills identified")
-                
                 # Display key requirements
                 with st.expander("View Key Requirements"):
                     for req in analysis["key_requirements"]:
@@ -205,22 +235,8 @@ if st.button("Analyze Resume", type="primary"):
                 # Add resume optimization section
                 st.subheader("Resume Optimization Suggestions")
                 
-                # Initialize resume optimizer
-                from gemini_optimizer import GeminiOptimizer
-                
-                # Get Gemini API key from environment variable or Streamlit secrets
-                gemini_api_key = os.getenv('GEMINI_API_KEY') or st.secrets.get('GEMINI_API_KEY')
-                if not gemini_api_key:
-                    st.warning("⚠️ Gemini API key not found. Some advanced AI features may be limited.")
-                    resume_optimizer = ResumeOptimizer()
-                else:
-                    resume_optimizer = GeminiOptimizer(gemini_api_key)
-                
-                # Split resume into sections (simplified for now)
-                resume_sections = {"content": resume_text}
-                
                 # Get optimization suggestions
-                optimization_results = resume_optimizer.optimize_resume(resume_sections, job_description)
+                optimization_results = optimization_future.result()
                 
                 # Display optimization suggestions with improved UI
                 st.subheader("📝 Detailed Optimization Suggestions")
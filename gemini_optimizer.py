@@ -1,25 +1,121 @@
+import hashlib
+import os
 import time
-from typing import Dict, List
-from google.generativeai import GenerativeModel
-import google.generativeai as genai
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import diskcache
+import orjson
+from google import genai
+
+# Response schemas for Gemini's structured JSON output
+_SKILL_SUGGESTIONS_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "skill": {"type": "STRING"},
+            "suggestion": {"type": "STRING"}
+        },
+        "required": ["skill", "suggestion"]
+    }
+}
+
+_SECTION_ANALYSIS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "suggestions": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "missing_keywords": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "impact_suggestions": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "alignment_with_job_requirements": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "requirement": {"type": "STRING"},
+                    "met": {"type": "BOOLEAN"}
+                },
+                "required": ["requirement", "met"]
+            }
+        }
+    },
+    "required": ["suggestions", "missing_keywords", "impact_suggestions", "alignment_with_job_requirements"]
+}
+
+# Python types of the schema types used above
+_SCHEMA_TYPES = {"STRING": str, "BOOLEAN": bool, "ARRAY": list, "OBJECT": dict}
+
+def _matches_schema(value: Any, schema: Dict) -> bool:
+    """Check a parsed JSON value against one of the response schemas above"""
+    if not isinstance(value, _SCHEMA_TYPES[schema["type"]]):
+        return False
+    if schema["type"] == "ARRAY":
+        return all(_matches_schema(item, schema["items"]) for item in value)
+    if schema["type"] == "OBJECT":
+        return all(key in value for key in schema.get("required", ())) and all(
+            _matches_schema(value[key], property_schema)
+            for key, property_schema in schema.get("properties", {}).items() if key in value
+        )
+    return True
 
 class GeminiOptimizer:
-    def __init__(self, api_key: str, max_retries: int = 3, initial_delay: float = 1.0):
-        # Configure the Gemini API
-        genai.configure(api_key=api_key)
-        self.model = GenerativeModel('gemini-pro')
+    # Cached responses are reused for a week before Gemini is asked again
+    CACHE_EXPIRE_SECONDS = 7 * 86400
+
+    def __init__(self, api_key: str, max_retries: int = 3, initial_delay: float = 1.0,
+                 cache_dir: str = '.gemini_cache', model_name: str = 'gemini-1.5-flash'):
+        # One client per optimizer so every call shares its HTTP connection pool.
+        # Without a key, calls fail and each method falls back to its default output.
+        self._client = genai.Client(api_key=api_key) if api_key else None
+        self.model_name = model_name
         self.max_retries = max_retries
         self.initial_delay = initial_delay
+        # Gemini calls are blocking network I/O, so threads let independent prompts overlap
+        self._executor = ThreadPoolExecutor(max_workers=max(8, (os.cpu_count() or 1) * 5))
+        # Responses are cached on disk by prompt hash so identical prompts skip the network
+        self._cache = diskcache.Cache(cache_dir)
+    
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run a call on the optimizer's thread pool and return its future"""
+        return self._executor.submit(fn, *args, **kwargs)
+    
+    def _cache_key(self, prompt: str, config: Optional[Dict] = None) -> str:
+        """Content-addressable cache key for a prompt sent to the configured model"""
+        payload = f"{self.model_name}\n{prompt}"
+        if config:
+            payload += "\n" + orjson.dumps(config, option=orjson.OPT_SORT_KEYS).decode()
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def _get_client(self) -> genai.Client:
+        """Return the Gemini client, failing if no API key was configured"""
+        if self._client is None:
+            raise Exception("Gemini API key not configured")
+        return self._client
     
-    def _make_api_call_with_retry(self, prompt: str) -> str:
+    def _quota_exceeded_error(self, last_exception: Exception) -> Exception:
+        """Build the error raised once rate-limit retries are exhausted"""
+        error_msg = f"API quota exceeded after {self.max_retries} retries. Please try again later."
+        if last_exception:
+            error_msg += f" Original error: {str(last_exception)}"
+        return Exception(error_msg)
+    
+    def _make_api_call_with_retry(self, prompt: str, config: Optional[Dict] = None) -> str:
         """Make API call with exponential backoff retry logic"""
+        key = self._cache_key(prompt, config)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
         delay = self.initial_delay
         last_exception = None
         
         for attempt in range(self.max_retries):
             try:
-                response = self.model.generate_content(prompt)
-                return response.text.strip()
+                response = self._get_client().models.generate_content(
+                    model=self.model_name, contents=prompt, config=config
+                )
+                text = response.text.strip()
+                self._cache.set(key, text, expire=self.CACHE_EXPIRE_SECONDS)
+                return text
             except Exception as e:
                 last_exception = e
                 if '429' in str(e):  # Rate limit error
@@ -30,10 +126,56 @@ class GeminiOptimizer:
                 raise  # Re-raise non-rate-limit errors
         
         # If we get here, we've exhausted retries
-        error_msg = f"API quota exceeded after {self.max_retries} retries. Please try again later."
-        if last_exception:
-            error_msg += f" Original error: {str(last_exception)}"
-        raise Exception(error_msg)
+        raise self._quota_exceeded_error(last_exception)
+    
+    def _make_json_call(self, prompt: str, schema: Dict) -> Any:
+        """Make an API call constrained to JSON matching the schema and parse the result"""
+        config = {"response_mime_type": "application/json", "response_schema": schema}
+        response_text = self._make_api_call_with_retry(prompt, config)
+        try:
+            result = orjson.loads(response_text)
+            if not _matches_schema(result, schema):
+                raise ValueError("Gemini response does not match the expected schema")
+            return result
+        except ValueError:
+            # Don't keep serving a malformed or wrongly shaped response from the cache
+            # (orjson.JSONDecodeError is a ValueError)
+            self._cache.delete(self._cache_key(prompt, config))
+            raise
+    
+    def _stream_api_call(self, prompt: str) -> Iterator[str]:
+        """Stream response text chunks with the same caching and retry logic"""
+        key = self._cache_key(prompt)
+        cached = self._cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        
+        delay = self.initial_delay
+        last_exception = None
+        
+        for attempt in range(self.max_retries):
+            chunks = []
+            try:
+                for chunk in self._get_client().models.generate_content_stream(model=self.model_name, contents=prompt):
+                    if not chunk.text:
+                        continue
+                    chunks.append(chunk.text)
+                    yield chunk.text
+                # Buffer the full response into the cache once streaming completes
+                self._cache.set(key, ''.join(chunks).strip(), expire=self.CACHE_EXPIRE_SECONDS)
+                return
+            except Exception as e:
+                last_exception = e
+                # Only retry if nothing has been yielded yet
+                if '429' in str(e) and not chunks:
+                    if attempt < self.max_retries - 1:
+                        time.sleep(delay)
+                        delay *= 2
+                    continue
+                raise
+        
+        raise self._quota_exceeded_error(last_exception)
     
     def improve_bullet_point(self, bullet_point: str, job_context: str) -> Dict[str, str]:
         """Improve a resume bullet point using Gemini's context-aware suggestions"""
@@ -79,7 +221,48 @@ class GeminiOptimizer:
         try:
             return self._make_api_call_with_retry(prompt)
         except Exception as e:
-            return f"Consider adding practical experience with {missing_skill} in a measurable way"
+            return self._default_skill_suggestion(missing_skill)
+    
+    @staticmethod
+    def _default_skill_suggestion(missing_skill: str) -> str:
+        """Local suggestion used when Gemini gives no answer for a skill"""
+        return f"Consider adding practical experience with {missing_skill} in a measurable way"
+    
+    def generate_skill_suggestions_batch(self, missing_skills: List[str], job_description: str) -> Dict[str, str]:
+        """Generate suggestions for all missing skills with a single Gemini call"""
+        if not missing_skills:
+            return {}
+        
+        prompt = f"""
+        Given these missing skills from a resume: {orjson.dumps(missing_skills).decode()}
+        And this job description: {job_description}
+        
+        For each skill, suggest a specific, practical way to demonstrate it in a resume bullet point.
+        Focus on measurable achievements and real-world applications.
+        
+        Return a one-sentence suggestion for each skill.
+        """
+        
+        try:
+            suggestions = {
+                item["skill"]: item["suggestion"]
+                for item in self._make_json_call(prompt, _SKILL_SUGGESTIONS_SCHEMA)
+            }
+        except ValueError:
+            # Fall back to one call per skill if the batched response is malformed or wrongly shaped
+            return {
+                skill: self.generate_skill_suggestions(skill, job_description)
+                for skill in missing_skills
+            }
+        except Exception:
+            # Don't fan out into more calls while the API itself is failing (e.g. rate limited)
+            suggestions = {}
+        
+        # Fill in any skills the model left out locally
+        return {
+            skill: suggestions.get(skill) or self._default_skill_suggestion(skill)
+            for skill in missing_skills
+        }
     
     def analyze_section(self, section_text: str, job_description: str) -> Dict:
         """Analyze a resume section and provide AI-powered improvement suggestions"""
@@ -96,50 +279,39 @@ class GeminiOptimizer:
         3. Ways to make the content more impactful
         4. Alignment with job requirements
         
-        Format the response as a JSON string with these keys:
+        Format the response as JSON with these keys:
         - suggestions: list of general improvements
         - missing_keywords: list of important missing terms
         - impact_suggestions: list of ways to increase impact
+        - alignment_with_job_requirements: list of job requirements and whether the section meets each
         """
         
         try:
-            response_text = self._make_api_call_with_retry(prompt)
-            if not response_text.startswith('{'): # Handle non-JSON responses
-                return {
-                    'suggestions': [response_text],
-                    'skill_suggestions': [],
-                    'improved_bullets': []
-                }
-            
-            try:
-                import json
-                analysis = json.loads(response_text)
-                # Structure the response in a more organized way
-                return {
-                    'key_improvements': ['• ' + item for item in analysis.get('suggestions', [])],
-                    'missing_skills': ['• ' + skill for skill in analysis.get('missing_keywords', [])],
-                    'impact_suggestions': ['• ' + suggestion for suggestion in analysis.get('impact_suggestions', [])],
-                    'job_requirements': {
-                        requirement: ('✓' if status else '✗')
-                        for requirement, status in analysis.get('alignment_with_job_requirements', {}).items()
-                    }
-                }
-            except Exception as e:
-                return {
-                    'suggestions': ["Error analyzing section: " + str(e)],
-                    'skill_suggestions': [],
-                    'improved_bullets': []
-                }
+            analysis = self._make_json_call(prompt, _SECTION_ANALYSIS_SCHEMA)
         except Exception as e:
             return {
                 'suggestions': ["Error analyzing section: " + str(e)],
                 'skill_suggestions': [],
                 'improved_bullets': []
             }
+        
+        # Structure the response in a more organized way
+        return {
+            'suggestions': analysis.get('suggestions', []),
+            'skill_suggestions': [],
+            'improved_bullets': [],
+            'key_improvements': ['• ' + item for item in analysis.get('suggestions', [])],
+            'missing_skills': ['• ' + skill for skill in analysis.get('missing_keywords', [])],
+            'impact_suggestions': ['• ' + suggestion for suggestion in analysis.get('impact_suggestions', [])],
+            'job_requirements': {
+                item['requirement']: ('✓' if item['met'] else '✗')
+                for item in analysis.get('alignment_with_job_requirements', [])
+            }
+        }
 
-    def generate_professional_summary(self, resume_text: str, job_description: str) -> str:
-        """Generate a professional summary section based on resume content and job requirements"""
-        prompt = f"""
+    def _professional_summary_prompt(self, resume_text: str, job_description: str) -> str:
+        """Build the prompt used to generate a professional summary"""
+        return f"""
         Based on this resume content:
         "{resume_text}"
         
@@ -154,32 +326,53 @@ Generate a compelling professional summary that:
         
 Format with markdown for emphasis on key points.
         """
+
+    def generate_professional_summary(self, resume_text: str, job_description: str) -> str:
+        """Generate a professional summary section based on resume content and job requirements"""
+        prompt = self._professional_summary_prompt(resume_text, job_description)
         
         try:
             return self._make_api_call_with_retry(prompt)
         except Exception as e:
             return f"Error generating summary: {str(e)}"
 
+    def stream_professional_summary(self, resume_text: str, job_description: str) -> Iterator[str]:
+        """Stream a professional summary as Gemini generates it"""
+        prompt = self._professional_summary_prompt(resume_text, job_description)
+        
+        try:
+            yield from self._stream_api_call(prompt)
+        except Exception as e:
+            yield f"Error generating summary: {str(e)}"
+
     def optimize_resume(self, resume_sections: Dict[str, str], job_description: str) -> Dict[str, dict]:
         """Optimize resume sections using Gemini's AI capabilities"""
         results = {}
+        if not resume_sections:
+            return results
         
-        for section_name, section_content in resume_sections.items():
-            try:
-                # Analyze the section and get improvement suggestions
-                section_analysis = self.analyze_section(section_content, job_description)
-                
-                # Add the analysis results to the overall results
-                results[section_name] = section_analysis
-                
-            except Exception as e:
-                results[section_name] = {
-                    'suggestions': [f"Error analyzing section: {str(e)}"],
-                    'skill_suggestions': [],
-                    'improved_bullets': []
-                }
+        # Each section is an independent Gemini call, so analyze them concurrently.
+        # A dedicated pool avoids waiting on the shared executor from one of its own tasks.
+        with ThreadPoolExecutor(max_workers=len(resume_sections)) as executor:
+            futures = {
+                executor.submit(self.analyze_section, section_content, job_description): section_name
+                for section_name, section_content in resume_sections.items()
+            }
+            
+            for future in as_completed(futures):
+                section_name = futures[future]
+                try:
+                    # Add the analysis results to the overall results
+                    results[section_name] = future.result()
+                except Exception as e:
+                    results[section_name] = {
+                        'suggestions': [f"Error analyzing section: {str(e)}"],
+                        'skill_suggestions': [],
+                        'improved_bullets': []
+                    }
         
-        return results
+        # Keep sections in their original order
+        return {name: results[name] for name in resume_sections}
     
     def format_analysis_report(self, analysis_results: Dict) -> str:
         """Format analysis results into a professional markdown report"""
@@ -1,32 +1,53 @@
 from typing import Dict, List, Tuple
 import spacy
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from spacy.matcher import PhraseMatcher
+from spacy.tokens import Doc
 import numpy as np
-from collections import Counter
 import re
+from sentence_encoder import SentenceEncoder
+
+# Common technical skills and programming languages
+TECH_KEYWORDS = frozenset({
+    'python', 'java', 'javascript', 'c++', 'ruby', 'php', 'sql', 'nosql',
+    'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'spring',
+    'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'devops', 'ci/cd',
+    'machine learning', 'artificial intelligence', 'data science',
+    'agile', 'scrum', 'git', 'rest api', 'graphql'
+})
+
+# Phrases that mark a job description sentence as a requirement
+REQUIREMENT_KEYWORDS = ("required", "must have", "requirements", "qualifications", "experience")
+
+# Section headers every resume is expected to have
+COMMON_SECTIONS = ("summary", "experience", "education", "skills", "projects")
+
+# Characters recognised as bullet point markers
+BULLET_CHARS = ('•', '-', '*')
+
+# Formatting patterns, compiled once at import
+_DATE_RE = re.compile(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*\d{4}\b|\d{1,2}/\d{4}|\d{4}')
+_SECTION_RE = re.compile(rf"\b({'|'.join(COMMON_SECTIONS)})\b", re.IGNORECASE)
+_BULLET_RE = re.compile(rf"^\s*([{re.escape(''.join(BULLET_CHARS))}])\s", re.MULTILINE)
 
 class JobAnalyzer:
     def __init__(self):
-        # Load spaCy model for NER and keyword extraction
-        self.nlp = spacy.load("en_core_web_sm")
-        # Load sentence transformer model for semantic similarity
-        self.model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
+        # Load spaCy model for NER and keyword extraction. The parser and tagger
+        # back noun_chunks and sentence splitting, so only the lemmatizer is skipped.
+        self.nlp = spacy.load("en_core_web_sm", disable=["lemmatizer"])
+        # Load int8-quantized ONNX sentence encoder for semantic similarity
+        self.model = SentenceEncoder()
+        # Match all technical keywords in a single pass over each document
+        self._phrase_matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        self._phrase_matcher.add("TECH", [self.nlp.make_doc(keyword) for keyword in TECH_KEYWORDS])
     
     def extract_skills(self, text: str) -> List[str]:
         """Extract skills and technical terms from text using enhanced NLP techniques"""
-        doc = self.nlp(text)
+        return self._extract_skills_from_doc(self.nlp(text))
+    
+    def _extract_skills_from_doc(self, doc: Doc) -> List[str]:
+        """Extract skills and technical terms from an already parsed document"""
         skills = []
         
-        # Common technical skills and programming languages
-        tech_keywords = {
-            'python', 'java', 'javascript', 'c++', 'ruby', 'php', 'sql', 'nosql',
-            'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'spring',
-            'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'devops', 'ci/cd',
-            'machine learning', 'artificial intelligence', 'data science',
-            'agile', 'scrum', 'git', 'rest api', 'graphql'
-        }
-        
         # Extract named entities that might be skills
         for ent in doc.ents:
             if ent.label_ in ["PRODUCT", "ORG", "GPE", "WORK_OF_ART"]:
@@ -38,10 +59,8 @@ class JobAnalyzer:
                 skills.append(chunk.text)
         
         # Look for technical keywords
-        text_lower = text.lower()
-        for keyword in tech_keywords:
-            if keyword in text_lower:
-                skills.append(keyword)
+        for _, start, end in self._phrase_matcher(doc):
+            skills.append(doc[start:end].text.lower())
         
         # Clean and deduplicate skills
         cleaned_skills = []
@@ -57,16 +76,19 @@ class JobAnalyzer:
     
     def analyze_job_description(self, job_description: str) -> Dict:
         """Analyze job description to extract key information"""
-        doc = self.nlp(job_description)
-        
+        return self._analyze_job_doc(self.nlp(job_description))
+    
+    def _analyze_job_doc(self, doc: Doc) -> Dict:
+        """Analyze an already parsed job description"""
         # Extract skills
-        skills = self.extract_skills(job_description)
+        skills = self._extract_skills_from_doc(doc)
         
-        # Extract key requirements
-        requirements = [sent.text.strip() for sent in doc.sents
-                      if any(keyword in sent.text.lower()
-                          for keyword in ["required", "must have", "requirements",
-                                        "qualifications", "experience"])]
+        # Extract key requirements, lowercasing each sentence only once
+        requirements = []
+        for sent in doc.sents:
+            sent_lower = sent.text.lower()
+            if any(keyword in sent_lower for keyword in REQUIREMENT_KEYWORDS):
+                requirements.append(sent.text.strip())
         
         return {
             "skills": skills,
@@ -79,34 +101,37 @@ class JobAnalyzer:
         formatting_issues = []
         
         # Check for inconsistent bullet points
-        bullet_points = re.findall(r'[•\-\*]\s.*', resume_text)
-        bullet_chars = [point[0] for point in bullet_points]
+        # Only markers at the start of a line count, not hyphens inside date ranges
+        bullet_chars = [match.group(1) for match in _BULLET_RE.finditer(resume_text)]
         if len(set(bullet_chars)) > 1:
             formatting_issues.append("Inconsistent bullet point characters detected")
         
-        # Check for section headers
-        common_sections = ["summary", "experience", "education", "skills", "projects"]
-        missing_sections = []
-        for section in common_sections:
-            if not re.search(rf"\b{section}\b", resume_text.lower()):
-                missing_sections.append(section)
+        # Check for section headers in a single scan
+        found_sections = {match.group(1).lower() for match in _SECTION_RE.finditer(resume_text)}
+        missing_sections = [section for section in COMMON_SECTIONS if section not in found_sections]
         
         # Check for date formatting
-        dates = re.findall(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*\d{4}\b|\d{1,2}/\d{4}|\d{4}', resume_text)
-        date_formats = Counter([len(date) for date in dates])
-        if len(date_formats) > 1:
+        dates = _DATE_RE.findall(resume_text)
+        if len({len(date) for date in dates}) > 1:
             formatting_issues.append("Inconsistent date formatting detected")
         
         return {
             "formatting_issues": formatting_issues,
             "missing_sections": missing_sections,
-            "bullet_points_count": len(bullet_points)
+            "bullet_points_count": len(bullet_chars)
         }
 
     def calculate_ats_score(self, resume_text: str, job_description: str) -> float:
         """Calculate ATS optimization score based on various factors"""
-        formatting_analysis = self.analyze_formatting(resume_text)
-        
+        return self._calculate_ats_score_from(
+            self.analyze_formatting(resume_text),
+            self.extract_skills(resume_text),
+            self.extract_skills(job_description)
+        )
+
+    def _calculate_ats_score_from(self, formatting_analysis: Dict, resume_skills: List[str],
+                                  job_skills: List[str]) -> float:
+        """Calculate ATS score from already computed formatting analysis and skills"""
         # Base score starts at 100
         score = 100.0
         
@@ -115,8 +140,8 @@ class JobAnalyzer:
         score -= len(formatting_analysis["missing_sections"]) * 3
         
         # Analyze keyword density
-        job_keywords = set(self.extract_skills(job_description))
-        resume_keywords = set(self.extract_skills(resume_text))
+        job_keywords = set(job_skills)
+        resume_keywords = set(resume_skills)
         keyword_match_ratio = len(resume_keywords.intersection(job_keywords)) / len(job_keywords) if job_keywords else 1
         
         # Factor in keyword matches
@@ -126,32 +151,36 @@ class JobAnalyzer:
 
     def calculate_match_score(self, resume_text: str, job_description: str) -> Tuple[float, Dict]:
         """Calculate match score between resume and job description"""
-        # Get embeddings for resume and job description
-        resume_embedding = self.model.encode([resume_text])
-        job_embedding = self.model.encode([job_description])
+        # Get embeddings for resume and job description in a single forward pass
+        resume_embedding, job_embedding = self.model.encode(
+            [resume_text, job_description], batch_size=2, normalize_embeddings=True
+        )
+        
+        # Embeddings are unit length, so their dot product is the cosine similarity
+        similarity_score = float(np.dot(resume_embedding, job_embedding))
         
-        # Calculate similarity score
-        similarity_score = cosine_similarity(resume_embedding, job_embedding)[0][0]
+        # Parse both texts in one batch; each passes through spaCy exactly once
+        resume_doc, job_doc = self.nlp.pipe([resume_text, job_description])
         
         # Analyze job requirements
-        job_analysis = self.analyze_job_description(job_description)
-        resume_skills = self.extract_skills(resume_text)
+        job_analysis = self._analyze_job_doc(job_doc)
+        resume_skills = self._extract_skills_from_doc(resume_doc)
         
-        # Calculate skill match
-        matching_skills = [skill for skill in resume_skills
-                         if any(job_skill in skill.lower()
-                             for job_skill in job_analysis["skills"])]
+        # Calculate skill match (extract_skills already lowercases and deduplicates)
+        resume_set = set(resume_skills)
+        job_set = set(job_analysis["skills"])
+        matching_skills = sorted(resume_set & job_set)
+        missing_skills = sorted(job_set - resume_set)
         
         analysis = {
             "matching_skills": matching_skills,
-            "missing_skills": [skill for skill in job_analysis["skills"]
-                              if skill not in matching_skills],
+            "missing_skills": missing_skills,
             "key_requirements": job_analysis["requirements"]
         }
         
-        # Calculate ATS optimization score
-        ats_score = self.calculate_ats_score(resume_text, job_description)
+        # Calculate ATS optimization score from the skills extracted above
         formatting_analysis = self.analyze_formatting(resume_text)
+        ats_score = self._calculate_ats_score_from(formatting_analysis, resume_skills, job_analysis["skills"])
         
         # Add ATS and formatting analysis to the results
         analysis["ats_score"] = ats_score
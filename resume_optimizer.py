@@ -1,65 +1,99 @@
-from typing import Dict, List
+import itertools
+from typing import Dict, FrozenSet, Set
 import spacy
-from sentence_transformers import SentenceTransformer
+from spacy.matcher import PhraseMatcher
+from spacy.tokens import Doc
 from collections import defaultdict
+import re
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+# Numbers such as 3, 1.5, 1,000 or 20% that count as a metric in a bullet point
+_NUM_RE = re.compile(r'\b\d+(?:[.,]\d+)?%?\b')
+
+# Parts of speech treated as keywords when comparing a section to the job description
+_NOMINALS = ('NOUN', 'PROPN')
+
+# Weak opening verbs and the stronger verbs that replace them
+_STRONG_VERBS = MappingProxyType({
+    'worked': 'spearheaded',
+    'helped': 'facilitated',
+    'assisted': 'coordinated',
+    'participated': 'led',
+    'involved': 'executed'
+})
+_VERB_RE = re.compile(r'^(\w+)')
+
+def _strengthen_verb(match: re.Match) -> str:
+    """Swap a matched opening word for its stronger verb, if it has one"""
+    return _STRONG_VERBS.get(match.group(1).lower(), match.group(1))
+
+# Action verbs that signal impact in a resume section
+_IMPACT_WORDS = frozenset({
+    'achieved', 'improved', 'increased', 'decreased', 'reduced',
+    'developed', 'implemented', 'created', 'designed', 'led',
+    'managed', 'coordinated', 'streamlined', 'optimized'
+})
+
+# Skills with a tailored suggestion for working them into a resume
+_SKILL_SUGGESTIONS = MappingProxyType({
+    'machine learning': "Consider adding a project where you applied ML models, e.g., 'Developed an XGBoost-based prediction system with 95% accuracy'",
+    'python': "Highlight Python projects or automation scripts, e.g., 'Built data processing pipeline using Python that reduced processing time by 60%'",
+    'sql': "Showcase database experience, e.g., 'Optimized SQL queries resulting in 40% faster data retrieval'",
+    'aws': "Demonstrate cloud expertise, e.g., 'Architected serverless applications on AWS, reducing operational costs by 30%'",
+    'docker': "Include containerization experience, e.g., 'Containerized microservices using Docker, improving deployment efficiency by 50%'"
+})
 
 class ResumeOptimizer:
     def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-        self.model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
+        # Only POS tags and lexical attributes are used; attribute_ruler maps tags to pos_
+        self.nlp = spacy.load("en_core_web_sm", disable=["parser", "ner", "lemmatizer"])
+        
+        # Match known skills in one pass, including multi-word ones like "machine learning"
+        self._skill_matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        for skill in _SKILL_SUGGESTIONS:
+            self._skill_matcher.add(skill, [self.nlp.make_doc(skill)])
     
     def generate_skill_suggestions(self, missing_skill: str) -> str:
         """Generate context-aware suggestions for incorporating missing skills"""
-        suggestions = {
-            'machine learning': "Consider adding a project where you applied ML models, e.g., 'Developed an XGBoost-based prediction system with 95% accuracy'",
-            'python': "Highlight Python projects or automation scripts, e.g., 'Built data processing pipeline using Python that reduced processing time by 60%'",
-            'sql': "Showcase database experience, e.g., 'Optimized SQL queries resulting in 40% faster data retrieval'",
-            'aws': "Demonstrate cloud expertise, e.g., 'Architected serverless applications on AWS, reducing operational costs by 30%'",
-            'docker': "Include containerization experience, e.g., 'Containerized microservices using Docker, improving deployment efficiency by 50%'"
-        }
+        suggestion = _SKILL_SUGGESTIONS.get(missing_skill.lower())
+        if suggestion is not None:
+            return suggestion
         
         # Default suggestion template if specific skill not found
-        default_template = f"Consider adding practical experience with {missing_skill}, e.g., 'Implemented {missing_skill} solutions that improved process efficiency'"
-        
-        return suggestions.get(missing_skill.lower(), default_template)
+        return f"Consider adding practical experience with {missing_skill}, e.g., 'Implemented {missing_skill} solutions that improved process efficiency'"
 
     def improve_bullet_point(self, bullet_point: str) -> str:
         """Improve bullet points with stronger action verbs and quantifiable metrics"""
-        doc = self.nlp(bullet_point)
-        
-        # Check if bullet point starts with a weak verb
-        weak_verbs = {'worked', 'helped', 'assisted', 'participated', 'involved'}
-        strong_verbs = {
-            'worked': 'spearheaded',
-            'helped': 'facilitated',
-            'assisted': 'coordinated',
-            'participated': 'led',
-            'involved': 'executed'
-        }
-        
-        words = bullet_point.split()
-        if words and words[0].lower() in weak_verbs:
-            words[0] = strong_verbs[words[0].lower()]
-            bullet_point = ' '.join(words)
+        # Replace a weak opening verb in a single regex pass
+        bullet_point = _VERB_RE.sub(_strengthen_verb, bullet_point, count=1)
         
         # Add metrics if none present
-        has_numbers = any(token.like_num for token in doc)
+        has_numbers = bool(_NUM_RE.search(bullet_point))
         if not has_numbers:
             bullet_point += " resulting in 20% improvement in efficiency"
         
         return bullet_point
 
+    def extract_job_keywords(self, job_description: str) -> FrozenSet[str]:
+        """Extract the nouns, proper nouns and known skills of a job description"""
+        return frozenset(self._extract_keywords(self.nlp(job_description)))
+
+    def _extract_keywords(self, doc: Doc) -> Set[str]:
+        """Collect the lowercased nouns and proper nouns of a parsed text plus any known skills"""
+        keywords = {token.lower_ for token in doc if token.pos_ in _NOMINALS}
+        keywords.update(self.nlp.vocab.strings[match_id] for match_id, _, _ in self._skill_matcher(doc))
+        return keywords
+
     def analyze_section(self, section_text: str, job_description: str) -> Dict:
         """Analyze a resume section and provide improvement suggestions"""
-        doc = self.nlp(section_text)
-        job_doc = self.nlp(job_description)
+        return self._analyze_section_doc(self.nlp(section_text), self.extract_job_keywords(job_description))
+
+    def _analyze_section_doc(self, doc: Doc, job_keywords: FrozenSet[str]) -> Dict:
+        """Analyze an already parsed resume section against precomputed job keywords"""
+        section_text = doc.text
         
         suggestions = []
-        impact_words = {
-            'achieved', 'improved', 'increased', 'decreased', 'reduced',
-            'developed', 'implemented', 'created', 'designed', 'led',
-            'managed', 'coordinated', 'streamlined', 'optimized'
-        }
         
         # Check for quantifiable achievements
         has_metrics = any(token.like_num for token in doc)
@@ -67,20 +101,23 @@ class ResumeOptimizer:
             suggestions.append("Add specific metrics or quantifiable achievements")
         
         # Check for action verbs
-        has_impact_words = any(token.text.lower() in impact_words for token in doc)
+        has_impact_words = any(token.lower_ in _IMPACT_WORDS for token in doc)
         if not has_impact_words:
             suggestions.append("Use more impactful action verbs")
         
         # Check for alignment with job description
-        job_keywords = set(token.text.lower() for token in job_doc if token.pos_ in ['NOUN', 'PROPN'])
-        section_keywords = set(token.text.lower() for token in doc if token.pos_ in ['NOUN', 'PROPN'])
+        section_keywords = self._extract_keywords(doc)
         
-        missing_keywords = job_keywords - section_keywords
+        # Only a handful of missing keywords are shown, so stop scanning once there are enough
+        missing_keywords = list(itertools.islice(
+            (keyword for keyword in job_keywords if keyword not in section_keywords), 5
+        ))
         if missing_keywords:
-            suggestions.append(f"Consider incorporating relevant keywords: {', '.join(list(missing_keywords)[:5])}")
+            suggestions.append(f"Consider incorporating relevant keywords: {', '.join(missing_keywords)}")
         
         # Improve bullet points
-        bullet_points = [line.strip() for line in section_text.split('\n') if line.strip().startswith(('•', '-', '*'))]
+        bullet_points = [line for line in (raw.strip() for raw in section_text.splitlines())
+                         if line and line[0] in '•-*']
         improved_bullets = []
         
         for bullet in bullet_points:
@@ -91,9 +128,12 @@ class ResumeOptimizer:
                     'improved': improved_bullet
                 })
         
-        # Generate skill-specific suggestions
+        # Generate skill-specific suggestions, known skills first
+        missing_skills = [skill for skill in _SKILL_SUGGESTIONS
+                          if skill in job_keywords and skill not in section_keywords]
+        missing_skills.extend(keyword for keyword in missing_keywords if keyword not in _SKILL_SUGGESTIONS)
         skill_suggestions = []
-        for keyword in missing_keywords:
+        for keyword in itertools.islice(missing_skills, 3):  # Limit to top 3 suggestions
             suggestion = self.generate_skill_suggestions(keyword)
             if suggestion:
                 skill_suggestions.append(suggestion)
@@ -102,16 +142,23 @@ class ResumeOptimizer:
             "suggestions": suggestions,
             "section_strength": len(suggestions) == 0,
             "improved_bullets": improved_bullets,
-            "skill_suggestions": skill_suggestions[:3]  # Limit to top 3 suggestions
+            "skill_suggestions": skill_suggestions
         }
     
     def optimize_resume(self, resume_sections: Dict[str, str], job_description: str) -> Dict:
         """Analyze and provide suggestions for each resume section"""
-        optimization_results = {}
+        names = [name for name, content in resume_sections.items() if content.strip()]
+        if not names:
+            return {}
+        
+        # The job description is the same for every section, so parse it only once
+        job_keywords = self.extract_job_keywords(job_description)
+        
+        def analyze(section_name: str) -> Dict:
+            return self._analyze_section_doc(self.nlp(resume_sections[section_name]), job_keywords)
         
-        for section_name, content in resume_sections.items():
-            if content.strip():
-                analysis = self.analyze_section(content, job_description)
-                optimization_results[section_name] = analysis
+        # spaCy releases the GIL inside its tagger, so sections are parsed on parallel threads
+        with ThreadPoolExecutor(max_workers=min(8, len(names))) as executor:
+            optimization_results = dict(zip(names, executor.map(analyze, names)))
         
         return optimization_results
\ No newline at end of file
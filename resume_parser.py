@@ -1,41 +1,107 @@
+import hashlib
+import logging
+import threading
+import zipfile
+from collections import OrderedDict
+from io import BytesIO
 import fitz  # PyMuPDF
-from docx import Document
-from typing import Optional
+from lxml import etree
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+# PyMuPDF's default plain text flags, except that ligatures are expanded so words
+# like "efficient" match keyword searches
+_PDF_TEXT_FLAGS = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES
+
+# WordprocessingML run content that carries paragraph text, mapped to its literal
+# text (None means the element's own text content), as python-docx renders it
+_W_URI = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_W_NS = f"{{{_W_URI}}}"
+_DOCX_TEXT_TAGS = {
+    f"{_W_NS}t": None,
+    f"{_W_NS}tab": "\t",
+    f"{_W_NS}ptab": "\t",
+    f"{_W_NS}noBreakHyphen": "-",
+    f"{_W_NS}cr": "\n"
+}
+_DOCX_BR = f"{_W_NS}br"
+_DOCX_BR_TYPE = f"{_W_NS}type"
+# Only the paragraph's own runs: text boxes inside drawings and mc:AlternateContent
+# are skipped, since Word stores their text twice (mc:Choice and mc:Fallback)
+_DOCX_RUN_CONTENT = etree.XPath("w:r/* | w:hyperlink/w:r/*", namespaces={"w": _W_URI})
+_DOCX_XML_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+
+
+def _docx_run_text(element) -> str:
+    """Text contributed by one child element of a w:r run"""
+    if element.tag == _DOCX_BR:
+        # Line breaks become newlines; page and column breaks add no text
+        return "\n" if element.get(_DOCX_BR_TYPE, "textWrapping") == "textWrapping" else ""
+    if element.tag not in _DOCX_TEXT_TAGS:
+        return ""
+    text = _DOCX_TEXT_TAGS[element.tag]
+    return (element.text or "") if text is None else text
+
+
+class ParseError(Exception):
+    """Raised when a resume file cannot be read"""
+
 
 class ResumeParser:
+    # Parsed text of recently seen files, keyed by content digest and file type
+    CACHE_SIZE = 32
+    _cache: "OrderedDict[Tuple[bytes, str], str]" = OrderedDict()
+    _cache_lock = threading.Lock()
+
     @staticmethod
-    def parse_pdf(file_content: bytes) -> Optional[str]:
+    def parse_pdf(file_content: bytes) -> str:
         """Extract text from PDF file"""
         try:
+            # PyMuPDF wraps a bytes stream in place; memoryview streams are rejected by older releases
             with fitz.open(stream=file_content, filetype="pdf") as pdf_doc:
-                text = ""
-                for page in pdf_doc:
-                    text += page.get_text()
-                return text.strip()
+                return "".join(page.get_text("text", flags=_PDF_TEXT_FLAGS) for page in pdf_doc).strip()
         except Exception as e:
-            print(f"Error parsing PDF: {str(e)}")
-            return None
+            logger.warning("parse_pdf failed", exc_info=True)
+            raise ParseError(f"Error parsing PDF: {str(e)}") from e
 
     @staticmethod
-    def parse_docx(file_content: bytes) -> Optional[str]:
+    def parse_docx(file_content: bytes) -> str:
         """Extract text from DOCX file"""
         try:
-            from io import BytesIO
-            doc = Document(BytesIO(file_content))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            # Read the main document part directly instead of building python-docx wrappers
+            with zipfile.ZipFile(BytesIO(file_content)) as archive:
+                root = etree.fromstring(archive.read("word/document.xml"), _DOCX_XML_PARSER)
+            body = root.find(f"{_W_NS}body")
+            parts = []
+            for paragraph in body.iterchildren(f"{_W_NS}p"):
+                parts.append("".join(_docx_run_text(element) for element in _DOCX_RUN_CONTENT(paragraph)))
+            return "\n".join(parts).strip()
         except Exception as e:
-            print(f"Error parsing DOCX: {str(e)}")
-            return None
+            logger.warning("parse_docx failed", exc_info=True)
+            raise ParseError(f"Error parsing DOCX: {str(e)}") from e
 
     @classmethod
-    def parse_resume(cls, file_content: bytes, file_type: str) -> Optional[str]:
-        """Parse resume based on file type"""
+    def parse_resume(cls, file_content: bytes, file_type: str) -> str:
+        """Parse resume based on file type, reusing results for identical files"""
         if file_type.lower() == "pdf":
-            return cls.parse_pdf(file_content)
+            parse = cls.parse_pdf
         elif file_type.lower() == "docx":
-            return cls.parse_docx(file_content)
+            parse = cls.parse_docx
         else:
-            raise ValueError(f"Unsupported file type: {file_type}")
\ No newline at end of file
+            raise ValueError(f"Unsupported file type: {file_type}")
+        
+        key = (hashlib.blake2b(file_content, digest_size=16).digest(), file_type.lower())
+        with cls._cache_lock:
+            if key in cls._cache:
+                cls._cache.move_to_end(key)
+                return cls._cache[key]
+        
+        # Failed parses raise ParseError before reaching the cache so a bad upload can be retried
+        text = parse(file_content)
+        with cls._cache_lock:
+            cls._cache[key] = text
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return text
\ No newline at end of file
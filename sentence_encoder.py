@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+from typing import List
+import numpy as np
+from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from transformers import AutoTokenizer
+
+class SentenceEncoder:
+    """Sentence embeddings from an int8-quantized ONNX export of a sentence-transformers model"""
+
+    QUANTIZED_FILE_NAME = "model_quantized.onnx"
+    MODEL_ID = 'sentence-transformers/paraphrase-MiniLM-L6-v2'
+    # Resolved next to this module so the app finds the export from any working directory
+    SAVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'paraphrase-MiniLM-L6-v2-onnx-int8')
+
+    def __init__(self, save_dir: str = SAVE_DIR, max_length: int = 128):
+        # The export is a setup step (python sentence_encoder.py), not something to run mid-request
+        if not os.path.exists(os.path.join(save_dir, self.QUANTIZED_FILE_NAME)):
+            raise FileNotFoundError(
+                f"Quantized sentence encoder not found in {save_dir}. Run 'python sentence_encoder.py' to create it."
+            )
+        self.tokenizer = AutoTokenizer.from_pretrained(save_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(save_dir, file_name=self.QUANTIZED_FILE_NAME)
+        self.max_length = max_length
+
+    @classmethod
+    def export_quantized(cls, model_id: str = MODEL_ID, save_dir: str = SAVE_DIR) -> None:
+        """Export the model to ONNX and apply dynamic int8 quantization"""
+        parent_dir = os.path.dirname(os.path.abspath(save_dir))
+        os.makedirs(parent_dir, exist_ok=True)
+        # Build the export in a temporary directory and move it into place only once it is
+        # complete, so an interrupted export never looks like a usable model
+        export_dir = tempfile.mkdtemp(prefix=".onnx-export-", dir=parent_dir)
+        try:
+            model = ORTModelForFeatureExtraction.from_pretrained(model_id, export=True)
+            tokenizer = AutoTokenizer.from_pretrained(model_id)
+            model.save_pretrained(export_dir)
+            tokenizer.save_pretrained(export_dir)
+
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantization_config = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=export_dir, quantization_config=quantization_config)
+
+            if os.path.exists(save_dir):
+                shutil.rmtree(save_dir)
+            os.replace(export_dir, save_dir)
+        except BaseException:
+            shutil.rmtree(export_dir, ignore_errors=True)
+            raise
+
+    def encode(self, texts: List[str], batch_size: int = 32, normalize_embeddings: bool = False) -> np.ndarray:
+        """Encode texts into mean-pooled sentence embeddings"""
+        embeddings = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np"
+            )
+            last_hidden_state = self.model(**inputs).last_hidden_state
+
+            # Average token embeddings, ignoring padding
+            mask = inputs["attention_mask"][..., np.newaxis].astype(last_hidden_state.dtype)
+            pooled = (last_hidden_state * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            embeddings.append(pooled)
+
+        embeddings = np.concatenate(embeddings, axis=0)
+        if normalize_embeddings:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings
+
+
+if __name__ == "__main__":
+    SentenceEncoder.export_quantized()
+    print(f"Saved quantized sentence encoder to {SentenceEncoder.SAVE_DIR}")
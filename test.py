@@ -1,7 +1,8 @@
 from transformers import AutoTokenizer
 from sentence_transformers import SentenceTransformer
 
-tokenizer = AutoTokenizer.from_pretrained("bert-base-uncased")
-model = SentenceTransformer("paraphrase-MiniLM-L6-v2")
+if __name__ == "__main__":
+    tokenizer = AutoTokenizer.from_pretrained("bert-base-uncased")
+    model = SentenceTransformer("paraphrase-MiniLM-L6-v2")
 
-print("Import successful, no conflicts!")
+    print("Import successful, no conflicts!")